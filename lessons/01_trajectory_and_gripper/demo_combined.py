@@ -7,12 +7,12 @@ Each demo is executed twice, in order.
 
 No imports from the demo files.
 No refactoring required.
-Uses subprocess to preserve known-good behavior.
+Runs each script in-process with runpy (as __main__), so the
+interpreter and serial/math modules are loaded once, not per pass.
 """
 
-import subprocess
+import runpy
 import time
-import sys
 from pathlib import Path
 
 # =========================
@@ -20,7 +20,6 @@ from pathlib import Path
 # =========================
 
 BASE_DIR = Path(__file__).parent
-PYTHON = sys.executable  # ensures venv python is used
 
 DEMOS = [
     ("Lissajous Demo", BASE_DIR / "demo_lissajous.py"),
@@ -36,10 +35,11 @@ PAUSE_BETWEEN = 2.0  # seconds
 
 def run_demo(name, script_path, pass_num):
     print(f"\n--- {name} (Pass {pass_num}) ---")
-    subprocess.run(
-        [PYTHON, str(script_path)],
-        check=True
-    )
+    try:
+        runpy.run_path(str(script_path), run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{name} exited with {e.code}") from e
 
 def main():
     print("=== Lesson 01 — Combined Demo ===")
@@ -6,6 +6,7 @@ This script streams a 3D Lissajous curve (figure-8) using T=1041.
 It demonstrates real-time parametric path planning and dynamic wrist orientation.
 """
 
+import os
 import time
 import json
 import serial
@@ -24,6 +25,19 @@ def send_json(ser, msg):
     line = json.dumps(msg) + "\n"
     ser.write(line.encode("utf-8"))
 
+def stream_write(ser, fd, buf):
+    """
+    Raw os.write on the port fd for the streaming loop (no pyserial
+    per-call checks). The fd is O_NONBLOCK, so a short or refused write
+    hands the remainder to ser.write, which waits for room.
+    """
+    try:
+        n = os.write(fd, buf)
+    except BlockingIOError:
+        n = 0
+    if n < len(buf):
+        ser.write(buf[n:])
+
 # =========================
 # Parameters
 # =========================
@@ -43,6 +57,30 @@ STEPS = 300     # total points in the path
 DT = 0.03       # seconds between points (~33 Hz)
 GRIPPER_RAD = 3.0
 
+# Fixed-shape T=1041 waypoint; r and g are constant, so bake them in
+T1041_FMT = b'{"T":1041,"x":%%.2f,"y":%%.2f,"z":%%.2f,"t":%%.2f,"r":0,"g":%.2f}\n' % GRIPPER_RAD
+
+# =========================
+# Path
+# =========================
+
+def lissajous_frames():
+    """Every T=1041 line of the figure-8, encoded once before streaming."""
+    frames = []
+    for i in range(STEPS + 1):
+        phi = 2.0 * math.pi * (i / STEPS)
+
+        # Parametric Equations for Figure-8
+        tx = CX + (LENGTH/2) * math.cos(phi)
+        ty = CY + WIDTH * math.sin(2 * phi)
+        tz = CZ + HEIGHT * math.sin(phi)
+
+        # Dynamic Tilt: Wrist pitches up/down based on Z-velocity
+        tt = 0.3 * math.cos(phi)
+
+        frames.append(T1041_FMT % (tx, ty, tz, tt))
+    return frames
+
 # =========================
 # Main
 # =========================
@@ -51,6 +89,9 @@ def main():
     print("=== Advanced Lissajous Streaming ===")
     print(f"Streaming at {1/DT:.1f} Hz...")
 
+    # The whole path is known up front; the stream loop only writes
+    frames = lissajous_frames()
+
     try:
         ser = open_serial(PORT, BAUD)
 
@@ -68,25 +109,16 @@ def main():
 
         # 3. Stream Lissajous Trajectory (T=1041)
         print("Executing 3D figure-8 pattern...")
-        for i in range(STEPS + 1):
-            phi = 2.0 * math.pi * (i / STEPS)
-
-            # Parametric Equations for Figure-8
-            tx = CX + (LENGTH/2) * math.cos(phi)
-            ty = CY + WIDTH * math.sin(2 * phi)
-            tz = CZ + HEIGHT * math.sin(phi)
-            
-            # Dynamic Tilt: Wrist pitches up/down based on Z-velocity
-            tt = 0.3 * math.cos(phi)
-
-            cmd = {
-                "T": 1041,
-                "x": round(tx, 2), "y": round(ty, 2), "z": round(tz, 2),
-                "t": round(tt, 2), "r": 0, "g": GRIPPER_RAD
-            }
-
-            send_json(ser, cmd)
-            time.sleep(DT)
+        # Absolute schedule (t0 + i*DT): time spent computing/writing a
+        # step comes out of that step's sleep instead of adding drift
+        fd = ser.fileno()
+        t0 = time.monotonic()
+        for i, frame in enumerate(frames, start=1):
+            stream_write(ser, fd, frame)
+
+            slack = t0 + i * DT - time.monotonic()
+            if slack > 0:
+                time.sleep(slack)
 
         # 4. Return to Safe / Candle Pose
         print("Returning to Candle Pose...")
@@ -35,12 +35,37 @@ def open_serial(port, baud):
 def send_json(ser, msg):
     ser.write((json.dumps(msg) + "\n").encode("utf-8"))
 
+# Fixed-shape T=1041 waypoint with z/t/r/g baked in; only x/y vary
+T1041_FMT = (
+    b'{"T":1041,"x":%%.2f,"y":%%.2f,"z":%.2f,"t":0,"r":0,"g":%.2f}\n'
+    % (CZ, GRIPPER_RAD)
+)
+
 # =========================
 # Spiral Demo
 # =========================
+def spiral_paths():
+    """Precompute IN and OUT waypoints; both passes share one angle table."""
+    unit = []
+    for i in range(STEPS):
+        theta = 2.0 * math.pi * (i / STEPS) * 3.0
+        unit.append((math.cos(theta), math.sin(theta)))
+
+    path_in, path_out = [], []
+    for i, (c, s) in enumerate(unit):
+        alpha = i / STEPS
+        r_in = (1 - alpha) * R_START + alpha * R_END
+        r_out = (1 - alpha) * R_END + alpha * R_START
+        path_in.append((CX + r_in * c, CY + r_in * s))
+        path_out.append((CX + r_out * c, CY + r_out * s))
+
+    return path_in, path_out
+
 def run_spiral_demo(ser):
     print("\n--- Starting Spiral Demo ---")
 
+    path_in, path_out = spiral_paths()
+
     # Move to start
     send_json(ser, {
         "T": 104,
@@ -51,35 +76,14 @@ def run_spiral_demo(ser):
     })
     time.sleep(1.5)
 
-    # Spiral IN
-    for i in range(STEPS):
-        alpha = i / STEPS
-        r = (1 - alpha) * R_START + alpha * R_END
-        theta = 2.0 * math.pi * alpha * 3.0
-
-        send_json(ser, {
-            "T": 1041,
-            "x": CX + r * math.cos(theta),
-            "y": CY + r * math.sin(theta),
-            "z": CZ,
-            "t": 0, "r": 0, "g": GRIPPER_RAD
-        })
-        time.sleep(DT)
-
-    # Spiral OUT
-    for i in range(STEPS):
-        alpha = i / STEPS
-        r = (1 - alpha) * R_END + alpha * R_START
-        theta = 2.0 * math.pi * alpha * 3.0
-
-        send_json(ser, {
-            "T": 1041,
-            "x": CX + r * math.cos(theta),
-            "y": CY + r * math.sin(theta),
-            "z": CZ,
-            "t": 0, "r": 0, "g": GRIPPER_RAD
-        })
-        time.sleep(DT)
+    # Spiral IN, then OUT, on an absolute t0 + i*DT schedule (no drift)
+    t0 = time.monotonic()
+    for i, (x, y) in enumerate(path_in + path_out, start=1):
+        ser.write(T1041_FMT % (x, y))
+
+        slack = t0 + i * DT - time.monotonic()
+        if slack > 0:
+            time.sleep(slack)
 
 # =========================
 # Main
@@ -7,6 +7,13 @@ BAUD = 115200
 # List of gripper commands (radians) you want to test
 G_VALUES = [1.2, 1.6, 2.0, 2.4, 2.8, 3.0, 3.2]
 
+# Fixed sweep pose; only "hand" changes. Every step is encoded up front.
+T102_FMT = (b'{"T":102,"base":0.0,"shoulder":1.5,"elbow":0.0,"wrist":0.0,'
+            b'"roll":0.0,"hand":%.3f,"spd":0,"acc":0}\n')
+SWEEP = [(g, T102_FMT % g) for g in G_VALUES]
+
+FEEDBACK_CMD = b'{"T":105}\n'
+
 def send(ser, cmd):
     ser.write((json.dumps(cmd) + "\n").encode("ascii"))
 
@@ -21,24 +28,13 @@ def main():
     print("Starting gripper sweep. For each value, measure the angle and write it down.")
     input("Position arm safely, then press ENTER to begin...")
 
-    for g in G_VALUES:
+    for g, frame in SWEEP:
         print(f"\nCommanding gripper g = {g:.3f} rad")
-        cmd = {
-            "T": 102,
-            "base": 0.0,
-            "shoulder": 1.5,
-            "elbow": 0.0,
-            "wrist": 0.0,
-            "roll": 0.0,
-            "hand": g,
-            "spd": 0,
-            "acc": 0,
-        }
-        send(ser, cmd)
+        ser.write(frame)
         time.sleep(1.0)  # wait to settle
 
         # Ask firmware for feedback (optional)
-        send(ser, {"T": 105})
+        ser.write(FEEDBACK_CMD)
         time.sleep(0.1)
         line = ser.readline().decode("ascii", errors="ignore").strip()
         if line:
@@ -9,13 +9,18 @@ FK/IK consistency test harness for the RoArm planar model.
 
 Run:
     python3 test_fk_ik_consistency.py
+
+The FK/IK round trip runs on NumPy arrays; test_batch_matches_scalar()
+checks those batch versions against the scalar fk_planar/ik_planar, and
+test_reach_limits() solves both workspace edges (also picked up by pytest).
 """
 
 import json
 import math
 import random
 from pathlib import Path
-from statistics import mean
+
+import numpy as np
 
 # ---------------------------------------------------------------------
 # 1) Load calibration parameters from planar_calib.json
@@ -36,6 +41,14 @@ Z0 = calib["Z0"]
 SHOULDER_OFFSET = calib["shoulder_offset"]
 ELBOW_OFFSET = calib["elbow_offset"]
 
+# Law-of-cosines terms that depend only on the link lengths
+IK_LSQ_SUM = L1 * L1 + L2 * L2
+IK_DENOM = 2.0 * L1 * L2
+
+# Slack on |cos(e_eff)| <= 1 so targets exactly at full extension / fully
+# folded are not rejected by a rounding error (e.g. 1.0000000000000007)
+REACH_EPS = 1e-9
+
 
 # ---------------------------------------------------------------------
 # 2) Planar FK: from (base, shoulder, elbow) -> (x, y, z)
@@ -63,15 +76,17 @@ def fk_planar(base: float, shoulder: float, elbow: float):
     Returns:
         (x, y, z) in mm in the firmware shoulder frame.
     """
+    sin, cos = math.sin, math.cos  # local lookups, used 6x below
+
     phi = shoulder + SHOULDER_OFFSET
     e_eff = elbow + ELBOW_OFFSET
     phi2 = phi + e_eff
 
-    x_p = L1 * math.sin(phi) + L2 * math.sin(phi2) + X0
-    z_p = L1 * math.cos(phi) + L2 * math.cos(phi2) + Z0
+    x_p = L1 * sin(phi) + L2 * sin(phi2) + X0
+    z_p = L1 * cos(phi) + L2 * cos(phi2) + Z0
 
-    cb = math.cos(base)
-    sb = math.sin(base)
+    cb = cos(base)
+    sb = sin(base)
 
     x = cb * x_p
     y = sb * x_p
@@ -80,6 +95,22 @@ def fk_planar(base: float, shoulder: float, elbow: float):
     return x, y, z
 
 
+def fk_planar_batch(base, shoulder, elbow):
+    """
+    fk_planar over length-N arrays in one NumPy pass.
+
+    Returns:
+        (x, y, z) as length-N arrays
+    """
+    phi = np.asarray(shoulder, dtype=float) + SHOULDER_OFFSET
+    phi2 = phi + (np.asarray(elbow, dtype=float) + ELBOW_OFFSET)
+
+    x_p = L1 * np.sin(phi) + L2 * np.sin(phi2) + X0
+    z_p = L1 * np.cos(phi) + L2 * np.cos(phi2) + Z0
+
+    return np.cos(base) * x_p, np.sin(base) * x_p, z_p
+
+
 # ---------------------------------------------------------------------
 # 3) Planar IK: from (x, y, z) -> (base, shoulder, elbow)
 #    Using triangle geometry / law of cosines.
@@ -97,6 +128,7 @@ def ik_planar(x: float, y: float, z: float):
 
         cos(e_eff) = (r^2 - L1^2 - L2^2) / (2 * L1 * L2)
         e_eff      = acos(...)
+        sin(e_eff) = sqrt(1 - cos(e_eff)^2)      (e_eff in [0, π])
         φ          = atan2(x_p, z) - atan2(L2*sin(e_eff), L1 + L2*cos(e_eff))
 
         shoulder = φ     - shoulder_offset
@@ -105,18 +137,19 @@ def ik_planar(x: float, y: float, z: float):
     Returns:
         (base, shoulder, elbow, ok_flag)
     """
-    base = math.atan2(y, x)
+    atan2 = math.atan2  # local lookup, used 3x below
+
+    base = atan2(y, x)
     x_p = math.hypot(x, y)
 
     # distance from shoulder to wrist in the planar (x_p, z) plane
     r2 = x_p * x_p + z * z
 
     # Law of cosines for e_eff
-    denom = 2.0 * L1 * L2
-    cos_e = (r2 - L1 * L1 - L2 * L2) / denom
+    cos_e = (r2 - IK_LSQ_SUM) / IK_DENOM
 
     # Numerical safety clamp to [-1, 1]
-    if cos_e < -1.0 or cos_e > 1.0:
+    if cos_e < -1.0 - REACH_EPS or cos_e > 1.0 + REACH_EPS:
         # Outside reach
         return 0.0, 0.0, 0.0, False
 
@@ -126,8 +159,11 @@ def ik_planar(x: float, y: float, z: float):
     # Geometry for φ
     # "Shoulder angle" to the wrist point, minus the triangle offset
     # atan2(L2*sin(e_eff), L1 + L2*cos(e_eff)) is the "elbow contribution"
-    phi_center = math.atan2(x_p, z)
-    phi_offset = math.atan2(L2 * math.sin(e_eff), L1 + L2 * math.cos(e_eff))
+    # acos returns e_eff in [0, π], so sin(e_eff) >= 0 follows from cos_e
+    # directly; no sin/cos of e_eff needed
+    sin_e = math.sqrt(1.0 - cos_e * cos_e)
+    phi_center = atan2(x_p, z)
+    phi_offset = atan2(L2 * sin_e, L1 + L2 * cos_e)
     phi = phi_center - phi_offset
 
     shoulder = phi - SHOULDER_OFFSET
@@ -136,65 +172,142 @@ def ik_planar(x: float, y: float, z: float):
     return base, shoulder, elbow, True
 
 
+def ik_planar_batch(x, y, z):
+    """
+    ik_planar over length-N arrays in one NumPy pass.
+
+    Same equations as ik_planar; out-of-reach targets come back as
+    zeros with ok[i] = False.
+
+    Returns:
+        (base, shoulder, elbow, ok) as length-N arrays
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+
+    base = np.arctan2(y, x)
+    x_p = np.hypot(x, y)
+
+    cos_e = (x_p * x_p + z * z - IK_LSQ_SUM) / IK_DENOM
+    ok = (cos_e >= -1.0 - REACH_EPS) & (cos_e <= 1.0 + REACH_EPS)
+
+    cos_e = np.clip(cos_e, -1.0, 1.0)
+    e_eff = np.arccos(cos_e)
+    sin_e = np.sqrt(1.0 - cos_e * cos_e)  # e_eff in [0, π] => sin >= 0
+    phi = np.arctan2(x_p, z) - np.arctan2(L2 * sin_e, L1 + L2 * cos_e)
+
+    shoulder = np.where(ok, phi - SHOULDER_OFFSET, 0.0)
+    elbow = np.where(ok, e_eff - ELBOW_OFFSET, 0.0)
+    base = np.where(ok, base, 0.0)
+
+    return base, shoulder, elbow, ok
+
+
 # ---------------------------------------------------------------------
 # 4) Sampling and consistency test
 # ---------------------------------------------------------------------
 
+# Sampling ranges (rad); approximate, tune to your real workspace
+BASE_RANGE = (-1.2, 1.2)
+SHOULDER_RANGE = (-0.2, 2.2)
+ELBOW_RANGE = (-1.2, 1.2)
+
+
 def sample_joint():
     """
     Sample a safe-ish triple (base, shoulder, elbow).
 
     These ranges are approximate and should be tuned to your real workspace.
     """
-    base = random.uniform(-1.2, 1.2)       # rad
-    shoulder = random.uniform(-0.2, 2.2)   # rad
-    elbow = random.uniform(-1.2, 1.2)      # rad
+    base = random.uniform(*BASE_RANGE)
+    shoulder = random.uniform(*SHOULDER_RANGE)
+    elbow = random.uniform(*ELBOW_RANGE)
     return base, shoulder, elbow
 
 
-def main():
-    N = 300  # number of random tests
+def sample_joints(n):
+    """n sample_joint triples as three length-n arrays (base, shoulder, elbow)."""
+    return np.array([sample_joint() for _ in range(n)]).T
+
 
-    pos_errors = []
-    bad_ik = 0
+def test_batch_matches_scalar(n=300):
+    """
+    The batch FK/IK used by main() must reproduce fk_planar/ik_planar
+    sample for sample. Raises AssertionError on the first mismatch.
+    """
+    b0, s0, e0 = sample_joints(n)
+    x0, y0, z0 = fk_planar_batch(b0, s0, e0)
+    b1, s1, e1, ok = ik_planar_batch(x0, y0, z0)
 
-    for i in range(N):
-        b0, s0, e0 = sample_joint()
+    for i in range(n):
+        target = fk_planar(b0[i], s0[i], e0[i])
+        if not np.allclose(target, (x0[i], y0[i], z0[i])):
+            raise AssertionError(f"batch FK differs at sample {i}: {target}")
 
-        # FK -> (x0, y0, z0)
-        x0, y0, z0 = fk_planar(b0, s0, e0)
+        *joints, ik_ok = ik_planar(*target)
+        if ik_ok != ok[i]:
+            raise AssertionError(f"batch IK reach flag differs at sample {i}")
+        if ik_ok and not np.allclose(joints, (b1[i], s1[i], e1[i])):
+            raise AssertionError(f"batch IK angles differ at sample {i}: {joints}")
+
+
+def test_reach_limits():
+    """
+    IK at the edges of the workspace, where cos(e_eff) is +/-1 and
+    sin(e_eff) = sqrt(1 - cos^2) is zero. Both limits must solve, to
+    e_eff = 0 (full extension) and e_eff = π (fully folded), in scalar
+    and batch IK alike. Raises AssertionError on failure.
+    """
+    # (x, y, z) straight out along x, with the expected e_eff
+    limits = [((L1 + L2, 0.0, 0.0), 0.0), ((abs(L1 - L2), 0.0, 0.0), math.pi)]
+
+    xs, ys, zs = np.array([t for t, _ in limits]).T
+    batch = np.array(ik_planar_batch(xs, ys, zs), dtype=float).T
+
+    for (target, e_eff), row in zip(limits, batch):
+        b, s, e, ok = ik_planar(*target)
+        if not (ok and row[3]):
+            raise AssertionError(f"IK rejected reach limit {target}")
+        if not all(math.isfinite(v) for v in (b, s, e)):
+            raise AssertionError(f"non-finite IK at {target}: {(b, s, e)}")
+        if not math.isclose(e + ELBOW_OFFSET, e_eff, abs_tol=1e-6):
+            raise AssertionError(f"e_eff at {target} is {e + ELBOW_OFFSET}, expected {e_eff}")
+        if not np.allclose((b, s, e), row[:3]):
+            raise AssertionError(f"batch IK differs at {target}")
+
+
+def main():
+    N = 300  # number of random tests
 
-        # IK -> (b1, s1, e1, ok)
-        b1, s1, e1, ok = ik_planar(x0, y0, z0)
-        if not ok:
-            bad_ik += 1
-            continue
+    # FK -> IK -> FK, each step over all N samples at once
+    b0, s0, e0 = sample_joints(N)
+    x0, y0, z0 = fk_planar_batch(b0, s0, e0)
 
-        # FK again from IK result
-        x1, y1, z1 = fk_planar(b1, s1, e1)
+    b1, s1, e1, ok = ik_planar_batch(x0, y0, z0)
+    bad_ik = int(np.count_nonzero(~ok))
 
-        dx = x1 - x0
-        dy = y1 - y0
-        dz = z1 - z0
-        pos_err = math.sqrt(dx * dx + dy * dy + dz * dz)
+    x1, y1, z1 = fk_planar_batch(b1, s1, e1)
+    errors = np.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2 + (z1 - z0) ** 2)
 
-        pos_errors.append(pos_err)
+    for i in range(0, N, 50):
+        if ok[i]:
+            print(f"[{i}] pos_err = {errors[i]:.3f} mm")
 
-        if i % 50 == 0:
-            print(f"[{i}] pos_err = {pos_err:.3f} mm")
+    pos_errors = errors[ok]
 
     print("\n=== FK/IK Consistency Summary ===")
     print(f"Total samples: {N}")
     print(f"IK failures : {bad_ik}")
 
-    if not pos_errors:
+    if pos_errors.size == 0:
         print("No successful IK samples.")
         return
 
-    print(f"Successful samples: {len(pos_errors)}")
+    print(f"Successful samples: {pos_errors.size}")
     print(f"Position error (mm):")
-    print(f"  mean = {mean(pos_errors):.3f}")
-    print(f"  max  = {max(pos_errors):.3f}")
+    print(f"  mean = {pos_errors.mean():.3f}")
+    print(f"  max  = {pos_errors.max():.3f}")
 
 
 if __name__ == "__main__":
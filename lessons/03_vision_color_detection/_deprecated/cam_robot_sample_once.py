@@ -18,6 +18,13 @@ import cv2
 import numpy as np
 from picamera2 import Picamera2
 
+# Optional: libjpeg-turbo SIMD encoder. Falls back to cv2.imwrite.
+try:
+    from turbojpeg import TurboJPEG, TJPF_GRAY, TJSAMP_GRAY, TJSAMP_420
+    _tj = TurboJPEG()
+except (ImportError, OSError, RuntimeError):  # RuntimeError: no libturbojpeg
+    _tj = None
+
 # ---------------- Camera / HSV config ----------------
 
 IMAGE_RAW  = "sample_frame.jpg"
@@ -30,12 +37,33 @@ IMAGE_ANN  = "sample_annotated.jpg"
 LOWER_HSV = np.array([110, 150, 120], dtype=np.uint8)
 UPPER_HSV = np.array([140, 255, 255], dtype=np.uint8)
 
+# Rect SEs use OpenCV's separable path. One 9x9 dilate == two 5x5 passes.
+ERODE_KERNEL  = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+DILATE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9))
+
 # ---------------- Robot config ----------------
 
 PORT = "/dev/ttyUSB0"
 BAUD = 115200
 
 
+def save_jpeg(path, img):
+    """Write img as JPEG, using TurboJPEG when it is available."""
+    if _tj is None:
+        cv2.imwrite(path, img)
+        return
+
+    if img.ndim == 2:
+        data = _tj.encode(img[:, :, None], quality=95,
+                          pixel_format=TJPF_GRAY, jpeg_subsample=TJSAMP_GRAY)
+    else:
+        # 4:2:0 like cv2.imwrite (TurboJPEG defaults to 4:2:2)
+        data = _tj.encode(img, quality=95, jpeg_subsample=TJSAMP_420)
+
+    with open(path, "wb") as f:
+        f.write(data)
+
+
 def capture_and_find_centroid():
     """Capture one frame with Picamera2 and return (u, v) and frame."""
     picam2 = Picamera2()
@@ -50,16 +78,15 @@ def capture_and_find_centroid():
     picam2.close()
 
     frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-    cv2.imwrite(IMAGE_RAW, frame)
+    save_jpeg(IMAGE_RAW, frame)
 
     hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
     mask = cv2.inRange(hsv, LOWER_HSV, UPPER_HSV)
 
-    kernel = np.ones((5, 5), np.uint8)
-    mask = cv2.erode(mask, kernel, iterations=1)
-    mask = cv2.dilate(mask, kernel, iterations=2)
+    mask = cv2.erode(mask, ERODE_KERNEL)
+    mask = cv2.dilate(mask, DILATE_KERNEL)
 
-    cv2.imwrite(IMAGE_MASK, mask)
+    save_jpeg(IMAGE_MASK, mask)
 
     contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL,
                                    cv2.CHAIN_APPROX_SIMPLE)
@@ -83,7 +110,8 @@ def capture_and_find_centroid():
     cx = int(M["m10"] / M["m00"])
     cy = int(M["m01"] / M["m00"])
 
-    annotated = frame.copy()
+    # Raw frame is already saved; draw straight onto the capture buffer
+    annotated = frame
     cv2.circle(annotated, (cx, cy), 8, (0, 0, 255), -1)
     cv2.drawContours(annotated, [largest], -1, (0, 255, 0), 2)
 
@@ -91,32 +119,36 @@ def capture_and_find_centroid():
     cv2.drawMarker(annotated, (w // 2, h // 2), (255, 0, 0),
                    markerType=cv2.MARKER_CROSS, markerSize=20, thickness=2)
 
-    cv2.imwrite(IMAGE_ANN, annotated)
+    save_jpeg(IMAGE_ANN, annotated)
 
     return cx, cy, annotated
 
 
-def get_robot_feedback():
-    """Send T=105 and return (x, y, z) from the T=1051 feedback."""
+def open_robot_serial():
+    """Open the robot UART once; it settles while the camera warms up."""
     ser = serial.Serial(PORT, BAUD, timeout=0.2)
-    time.sleep(0.2)
+    ser.setRTS(False)
+    ser.setDTR(False)
+    return ser
+
+
+def get_robot_feedback(ser):
+    """Send T=105 and return (x, y, z) from the T=1051 feedback."""
+    ser.reset_input_buffer()
 
     # Request feedback packet
     cmd = {"T": 105}
     ser.write((json.dumps(cmd) + "\n").encode("ascii"))
-    time.sleep(0.1)
 
-    lines = []
+    # Input was just flushed, so the first T=1051 line is our reply;
+    # readline's timeout does the waiting, and we stop as soon as it lands.
+    feedback = None
     for _ in range(5):
         line = ser.readline().decode("ascii", errors="ignore").strip()
-        if line:
-            lines.append(line)
-            print("UART:", line)
+        if not line:
+            continue
+        print("UART:", line)
 
-    ser.close()
-
-    feedback = None
-    for line in reversed(lines):
         if line.startswith("{") and line.endswith("}"):
             try:
                 obj = json.loads(line)
@@ -136,7 +168,7 @@ def get_robot_feedback():
     return x, y, z
 
 
-def main():
+def sample(ser):
     print("Capturing frame and detecting object...")
     u, v, _ = capture_and_find_centroid()
 
@@ -147,7 +179,7 @@ def main():
     print(f"Detected centroid pixel (u, v) = ({u}, {v})")
 
     print("Requesting robot feedback (T=105)...")
-    x, y, z = get_robot_feedback()
+    x, y, z = get_robot_feedback(ser)
 
     if x is None:
         print("No valid robot feedback; aborting sample.")
@@ -160,5 +192,13 @@ def main():
     print(f"  x = {x:.1f}, y = {y:.1f}, z = {z:.1f}")
 
 
+def main():
+    ser = open_robot_serial()
+    try:
+        sample(ser)
+    finally:
+        ser.close()
+
+
 if __name__ == "__main__":
     main()
@@ -30,6 +30,10 @@ IMAGE_RAW  = SCRIPT_DIR / "cam_live_frame.jpg"
 IMAGE_MASK = SCRIPT_DIR / "cam_live_mask.jpg"
 IMAGE_ANN  = SCRIPT_DIR / "cam_live_annotated.jpg"
 
+# Rect SEs use OpenCV's separable path. One 9x9 dilate == two 5x5 passes.
+ERODE_KERNEL  = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+DILATE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9))
+
 
 # ---------------- HSV Loading ----------------
 
@@ -78,9 +82,8 @@ def main():
     hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
     mask = cv2.inRange(hsv, lower_hsv, upper_hsv)
 
-    kernel = np.ones((5, 5), np.uint8)
-    mask = cv2.erode(mask, kernel, iterations=1)
-    mask = cv2.dilate(mask, kernel, iterations=2)
+    mask = cv2.erode(mask, ERODE_KERNEL)
+    mask = cv2.dilate(mask, DILATE_KERNEL)
 
     cv2.imwrite(str(IMAGE_MASK), mask)
     print("Saved mask to", IMAGE_MASK)
@@ -110,7 +113,8 @@ def main():
     cy = int(M["m01"] / M["m00"])
     print(f"Centroid pixel (u, v) = ({cx}, {cy})")
 
-    annotated = frame.copy()
+    # Raw frame is already saved; draw straight onto the capture buffer
+    annotated = frame
     cv2.circle(annotated, (cx, cy), 8, (0, 0, 255), -1)
     cv2.drawContours(annotated, [largest], -1, (0, 255, 0), 2)
 
@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
+import numpy as np
 from picamera2 import Picamera2
 from hsv_utils import load_hsv_config
 
+FRAME_W, FRAME_H = 1280, 720
+
+# Two detector threads already fill two cores; keep OpenCV's own
+# parallel_for from oversubscribing the Pi.
+cv2.setNumThreads(2)
+
 # Load visual classes
 chess_cfg = load_hsv_config(
     "lessons/03_vision_color_detection/hsv/chess_white.json"
@@ -13,50 +22,73 @@ tool_cfg = load_hsv_config(
     "lessons/03_vision_color_detection/hsv/tool_marker.json"
 )
 
-def detect_centroid(frame, cfg):
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    mask = cv2.inRange(hsv, cfg["hsv_min"], cfg["hsv_max"])
+def make_detector(cfg):
+    """Build a detector with the HSV bounds and min area bound as locals."""
+    hsv_min = cfg["hsv_min"]
+    hsv_max = cfg["hsv_max"]
+    min_area = cfg["min_area"]
+    mask = np.empty((FRAME_H, FRAME_W), np.uint8)
+
+    def detect_centroid(hsv):
+        cv2.inRange(hsv, hsv_min, hsv_max, dst=mask)
+
+        contours, _ = cv2.findContours(
+            mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        )
+        if not contours:
+            return None
 
-    contours, _ = cv2.findContours(
-        mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-    )
-    if not contours:
-        return None
+        c = max(contours, key=cv2.contourArea)
+        if cv2.contourArea(c) < min_area:
+            return None
 
-    c = max(contours, key=cv2.contourArea)
-    if cv2.contourArea(c) < cfg["min_area"]:
-        return None
+        M = cv2.moments(c)
+        if M["m00"] == 0:
+            return None
 
-    M = cv2.moments(c)
-    if M["m00"] == 0:
-        return None
+        return (
+            int(M["m10"] / M["m00"]),
+            int(M["m01"] / M["m00"])
+        )
 
-    return (
-        int(M["m10"] / M["m00"]),
-        int(M["m01"] / M["m00"])
-    )
+    return detect_centroid
+
+detect_chess = make_detector(chess_cfg)
+detect_tool = make_detector(tool_cfg)
 
 # Camera setup
 picam2 = Picamera2()
 cfg = picam2.create_still_configuration(
-    main={"format": "RGB888", "size": (1280, 720)}
+    main={"format": "RGB888", "size": (FRAME_W, FRAME_H)}
 )
 picam2.configure(cfg)
 picam2.start()
 
+# Shared HSV buffer, converted once per frame for both detectors
+hsv = np.empty((FRAME_H, FRAME_W, 3), np.uint8)
+
+# Each detector owns its mask buffer and only reads the shared HSV
+# array, so they can run concurrently (OpenCV releases the GIL).
+pool = ThreadPoolExecutor(max_workers=2)
+
 print("Dual-color detection test (Ctrl+C to exit)")
 
 try:
     while True:
         frame = picam2.capture_array()
 
-        chess_uv = detect_centroid(frame, chess_cfg)
-        tool_uv  = detect_centroid(frame, tool_cfg)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=hsv)
+
+        chess_job = pool.submit(detect_chess, hsv)
+        tool_job  = pool.submit(detect_tool, hsv)
+        chess_uv = chess_job.result()
+        tool_uv  = tool_job.result()
 
         print(f"Chess: {chess_uv} | Tool: {tool_uv}")
 
 except KeyboardInterrupt:
     pass
 
+pool.shutdown()
 picam2.close()
 print("Exited cleanly.")
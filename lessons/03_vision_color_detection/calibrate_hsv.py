@@ -26,6 +26,8 @@ PATCH_SIZE = 20      # size of sampling box (pixels)
 H_PAD = 10
 S_PAD = 40
 V_PAD = 40
+HSV_PAD = np.array([H_PAD, S_PAD, V_PAD])
+HSV_MAX = np.array([179, 255, 255])   # OpenCV 8-bit HSV ranges
 
 IMG_W = 1280
 IMG_H = 720
@@ -104,25 +106,15 @@ try:
         patch = frame[y1:y2, x1:x2]
         hsv_patch = cv2.cvtColor(patch, cv2.COLOR_BGR2HSV)
 
-        h_vals = hsv_patch[:, :, 0].astype(int)
-        s_vals = hsv_patch[:, :, 1].astype(int)
-        v_vals = hsv_patch[:, :, 2].astype(int)
-
-        h_min = int(np.min(h_vals) - H_PAD)
-        h_max = int(np.max(h_vals) + H_PAD)
-        s_min = int(np.min(s_vals) - S_PAD)
-        s_max = int(np.max(s_vals) + S_PAD)
-        v_min = int(np.min(v_vals) - V_PAD)
-        v_max = int(np.max(v_vals) + V_PAD)
-
-        # Clamp to OpenCV ranges
-        h_low, h_high = sorted([max(0, min(179, h_min)), max(0, min(179, h_max))])
-        s_low, s_high = sorted([max(0, min(255, s_min)), max(0, min(255, s_max))])
-        v_low, v_high = sorted([max(0, min(255, v_min)), max(0, min(255, v_max))])
+        # Per-channel min/max over the patch, padded, then clamped to
+        # OpenCV ranges in one vector op (clip keeps lower <= upper)
+        pixels = hsv_patch.reshape(-1, 3).astype(int)
+        lower = np.clip(pixels.min(axis=0) - HSV_PAD, 0, HSV_MAX)
+        upper = np.clip(pixels.max(axis=0) + HSV_PAD, 0, HSV_MAX)
 
         cfg_out = {
-            "lower": [h_low, s_low, v_low],
-            "upper": [h_high, s_high, v_high],
+            "lower": lower.tolist(),
+            "upper": upper.tolist(),
             "min_area": 300
         }
 
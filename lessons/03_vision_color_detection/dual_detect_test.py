@@ -108,7 +108,8 @@ def detect(mask, min_area):
 # ===============================
 # RUN DETECTION
 # ===============================
-annotated = frame.copy()
+# HSV is already computed, so draw straight onto the capture buffer
+annotated = frame
 
 if tool_cfg:
     tool_min, tool_max, tool_area = tool_cfg
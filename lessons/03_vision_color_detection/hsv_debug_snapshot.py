@@ -102,7 +102,8 @@ cv2.imwrite(str(V_IMG), v_color)
 # ===============================
 # DETECTION
 # ===============================
-annotated = frame.copy()
+# Raw frame is already saved; draw straight onto the capture buffer
+annotated = frame
 contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
 if contours:
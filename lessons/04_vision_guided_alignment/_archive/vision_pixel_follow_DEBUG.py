@@ -14,6 +14,8 @@ NO integration.
 
 import time
 import json
+import threading
+from collections import deque
 import numpy as np
 import cv2
 import serial
@@ -36,8 +38,28 @@ SAFE_Z = 120.0
 ser = serial.Serial(SERIAL_PORT, BAUD, timeout=0.01)
 time.sleep(2)
 
-def send_json(payload):
-    ser.write((json.dumps(payload) + "\n").encode())
+# Writer thread: a 1-slot deque coalesces targets so a stale pose is
+# replaced, not queued, while the UART drains the previous line.
+cmd_slot = deque(maxlen=1)
+cmd_ready = threading.Event()
+stop_write = threading.Event()
+
+def write_commands():
+    while not stop_write.is_set():
+        cmd_ready.wait(timeout=0.1)
+        cmd_ready.clear()
+        try:
+            line = cmd_slot.popleft()
+        except IndexError:
+            continue
+        ser.write(line)
+
+def send_async(line):
+    cmd_slot.append(line)
+    cmd_ready.set()
+
+writer = threading.Thread(target=write_commands, daemon=True)
+writer.start()
 
 # ==========================================================
 # ABSOLUTE TOOL POSITION (SMALL RANGE)
@@ -45,15 +67,10 @@ def send_json(payload):
 tool_x = 0.0
 tool_y = 0.0
 
+MOVE_FMT = b'{"T":1041,"x":%.2f,"y":%.2f,"z":%.2f,"spd":80,"acc":80}\n'
+
 def move(x, y, z):
-    send_json({
-        "T": 1041,
-        "x": float(x),
-        "y": float(y),
-        "z": float(z),
-        "spd": 80,
-        "acc": 80
-    })
+    send_async(MOVE_FMT % (x, y, z))
 
 # ==========================================================
 # LOAD HSV
@@ -63,7 +80,12 @@ with open(HSV_PATH, "r") as f:
 
 HSV_LOWER = np.array(hsv_raw["lower"], dtype=np.uint8)
 HSV_UPPER = np.array(hsv_raw["upper"], dtype=np.uint8)
-MIN_AREA = hsv_raw.get("min_area", 300)
+
+DOWNSCALE = 4   # detect on 320x180, scale centroid back up
+MIN_AREA = hsv_raw.get("min_area", 300) / (DOWNSCALE * DOWNSCALE)
+ROI_HALF = 80   # full-res search radius around the last centroid
+ROI_MIN_AREA = hsv_raw.get("min_area", 300)
+OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # drops speckle, keeps blob area
 
 # ==========================================================
 # CAMERA
@@ -72,12 +94,39 @@ IMG_W, IMG_H = 1280, 720
 
 picam2 = Picamera2()
 cfg = picam2.create_video_configuration(
-    main={"format": "RGB888", "size": (IMG_W, IMG_H)}
+    main={"format": "RGB888", "size": (IMG_W, IMG_H)},
+    queue=False,  # always wait for a fresh frame, never a queued one
 )
 picam2.configure(cfg)
 picam2.start()
 time.sleep(0.5)
 
+# ==========================================================
+# FRAME GRABBER (capture overlaps processing; newest frame wins)
+# ==========================================================
+frame_cv = threading.Condition()
+latest = {"frame": None}
+stop_grab = threading.Event()
+
+def grab_frames():
+    while not stop_grab.is_set():
+        f = picam2.capture_array()
+        with frame_cv:
+            latest["frame"] = f
+            frame_cv.notify()
+
+def next_frame():
+    """Block until a frame newer than the last one taken is available."""
+    with frame_cv:
+        while latest["frame"] is None:
+            frame_cv.wait()
+        f = latest["frame"]
+        latest["frame"] = None
+    return f
+
+grabber = threading.Thread(target=grab_frames, daemon=True)
+grabber.start()
+
 # ==========================================================
 # CONTROL (PIXEL SPACE)
 # ==========================================================
@@ -86,26 +135,80 @@ PIXEL_GAIN = 0.05   # mm per pixel
 MAX_STEP = 2.0
 LOOP_DT = 0.05
 
+def wait_next_tick(deadline):
+    """Sleep to the next fixed-phase tick; resync after an overrun."""
+    deadline += LOOP_DT
+    slack = deadline - time.monotonic()
+    if slack > 0:
+        time.sleep(slack)
+        return deadline
+    return time.monotonic()
+
+def step_toward(du, dv, x, y):
+    """Advance (x, y) by the pixel error times gain, capped per axis."""
+    dx = du * PIXEL_GAIN
+    if dx > MAX_STEP:
+        dx = MAX_STEP
+    elif dx < -MAX_STEP:
+        dx = -MAX_STEP
+
+    dy = dv * PIXEL_GAIN
+    if dy > MAX_STEP:
+        dy = MAX_STEP
+    elif dy < -MAX_STEP:
+        dy = -MAX_STEP
+
+    return x + dx, y + dy
+
 # ==========================================================
 # VISION
 # ==========================================================
+# Preallocated per-frame buffers (filled in place via dst=)
+SMALL_W, SMALL_H = IMG_W // DOWNSCALE, IMG_H // DOWNSCALE
+small_buf = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+hsv_buf   = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+mask_buf  = np.empty((SMALL_H, SMALL_W), np.uint8)
+
 def find_center(frame):
-    hsv = cv2.cvtColor(frame, cv2.COLOR_RGB2HSV)
-    mask = cv2.inRange(hsv, HSV_LOWER, HSV_UPPER)
+    cv2.resize(frame, (SMALL_W, SMALL_H), dst=small_buf,
+               interpolation=cv2.INTER_AREA)
+    # picamera2 "RGB888" is B,G,R in memory; profiles come from calibrate_hsv.py (BGR2HSV)
+    hsv = cv2.cvtColor(small_buf, cv2.COLOR_BGR2HSV, dst=hsv_buf)
+    mask = cv2.inRange(hsv, HSV_LOWER, HSV_UPPER, dst=mask_buf)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
 
-    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not cnts:
+    # One labeling pass gives every blob's area and centroid
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
 
-    c = max(cnts, key=cv2.contourArea)
-    if cv2.contourArea(c) < MIN_AREA:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
+        return None
+
+    u, v = cents[best]
+    return int(DOWNSCALE * u), int(DOWNSCALE * v)
+
+def find_in_roi(frame, last_uv):
+    """Full-res search in a small window around the last centroid."""
+    u0 = max(0, last_uv[0] - ROI_HALF)
+    v0 = max(0, last_uv[1] - ROI_HALF)
+    roi = frame[v0:last_uv[1] + ROI_HALF, u0:last_uv[0] + ROI_HALF]
+
+    hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv, HSV_LOWER, HSV_UPPER)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
+
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
 
-    M = cv2.moments(c)
-    if M["m00"] == 0:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < ROI_MIN_AREA:
         return None
 
-    return int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])
+    u, v = cents[best]
+    return u0 + int(u), v0 + int(v)
 
 # ==========================================================
 # MAIN LOOP
@@ -114,13 +217,23 @@ print("\n=== PIXEL FOLLOW DEBUG ===")
 print("Move the ball LEFT / RIGHT / UP / DOWN")
 print("CTRL+C to stop\n")
 
+last_uv = None
+next_tick = time.monotonic()
+
 try:
     while True:
-        frame = picam2.capture_array()
-        center = find_center(frame)
+        frame = next_frame()
 
+        # Track in a window around the last hit; full frame on a miss
+        center = None
+        if last_uv is not None:
+            center = find_in_roi(frame, last_uv)
         if center is None:
-            time.sleep(LOOP_DT)
+            center = find_center(frame)
+        last_uv = center
+
+        if center is None:
+            next_tick = wait_next_tick(next_tick)
             continue
 
         u, v = center
@@ -129,22 +242,22 @@ try:
         dv = v - IMG_H // 2
 
         if abs(du) < PIXEL_DEADBAND and abs(dv) < PIXEL_DEADBAND:
-            time.sleep(LOOP_DT)
+            next_tick = wait_next_tick(next_tick)
             continue
 
-        dx = np.clip(du * PIXEL_GAIN, -MAX_STEP, MAX_STEP)
-        dy = np.clip(dv * PIXEL_GAIN, -MAX_STEP, MAX_STEP)
-
-        tool_x += dx
-        tool_y += dy
+        tool_x, tool_y = step_toward(du, dv, tool_x, tool_y)
 
         move(tool_x, tool_y, SAFE_Z)
 
-        time.sleep(LOOP_DT)
+        next_tick = wait_next_tick(next_tick)
 
 except KeyboardInterrupt:
     print("\nStopping")
 
 finally:
+    stop_grab.set()
+    grabber.join(timeout=1.0)
     picam2.stop()
+    stop_write.set()
+    writer.join(timeout=1.0)
     ser.close()
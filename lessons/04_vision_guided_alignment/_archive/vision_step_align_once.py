@@ -41,6 +41,13 @@ HSV_PATH = os.path.expanduser(
 MAX_STEP_MM = 5.0     # absolute max per move
 DEADZONE_MM = 2.0     # no movement if inside this
 
+# ============================================================
+# VISION
+# ============================================================
+DOWNSCALE = 4         # detect on 320x180, scale centroid back up
+MIN_AREA  = 300 / (DOWNSCALE * DOWNSCALE)
+OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # drops speckle, keeps blob area
+
 # ============================================================
 # ROBOT SERIAL
 # ============================================================
@@ -59,15 +66,10 @@ def get_robot_xy():
             return msg["x"], msg["y"]
     return None
 
+MOVE_FMT = b'{"T":104,"x":%.2f,"y":%.2f,"spd":400,"acc":50}\n'
+
 def move_robot_xy(dx, dy):
-    cmd = {
-        "T": 104,
-        "x": dx,
-        "y": dy,
-        "spd": 400,
-        "acc": 50
-    }
-    ser.write((json.dumps(cmd) + "\n").encode())
+    ser.write(MOVE_FMT % (dx, dy))
 
 # ============================================================
 # LOAD HSV
@@ -82,6 +84,18 @@ with open(HSV_PATH, "r") as f:
 HSV_MIN = np.array(hsv_cfg["lower"], dtype=np.uint8)
 HSV_MAX = np.array(hsv_cfg["upper"], dtype=np.uint8)
 
+# Red can wrap 179 -> 0 (lower hue > upper hue): match [lo..179] | [0..hi]
+HUE_WRAPS = HSV_MIN[0] > HSV_MAX[0]
+HSV_MAX_179 = np.array([179, *HSV_MAX[1:]], dtype=np.uint8)
+HSV_MIN_0 = np.array([0, *HSV_MIN[1:]], dtype=np.uint8)
+
+def hsv_mask(hsv, dst=None):
+    if not HUE_WRAPS:
+        return cv2.inRange(hsv, HSV_MIN, HSV_MAX, dst=dst)
+    mask = cv2.inRange(hsv, HSV_MIN, HSV_MAX_179, dst=dst)
+    cv2.bitwise_or(mask, cv2.inRange(hsv, HSV_MIN_0, HSV_MAX), dst=mask)
+    return mask
+
 print("Loaded HSV:")
 print("  MIN:", HSV_MIN)
 print("  MAX:", HSV_MAX)
@@ -90,8 +104,9 @@ print("  MAX:", HSV_MAX)
 # CAMERA
 # ============================================================
 picam2 = Picamera2()
-cfg = picam2.create_still_configuration(
-    main={"format": "RGB888", "size": (1280, 720)}
+cfg = picam2.create_video_configuration(
+    main={"format": "RGB888", "size": (1280, 720)},
+    buffer_count=2,
 )
 picam2.configure(cfg)
 picam2.start()
@@ -103,27 +118,30 @@ time.sleep(0.3)
 frame = picam2.capture_array()
 picam2.close()
 
-hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-mask = cv2.inRange(hsv, HSV_MIN, HSV_MAX)
-
-contours, _ = cv2.findContours(
-    mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+small = cv2.resize(
+    frame, None, fx=1 / DOWNSCALE, fy=1 / DOWNSCALE,
+    interpolation=cv2.INTER_AREA,
 )
+hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+mask = hsv_mask(hsv)
+cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
+
+# One labeling pass gives every blob's area and centroid
+n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
 
-if not contours:
+if n < 2:
     print("ABORT: No marker detected")
     ser.close()
     sys.exit(0)
 
-c = max(contours, key=cv2.contourArea)
-if cv2.contourArea(c) < 300:
+best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
     print("ABORT: Marker too small")
     ser.close()
     sys.exit(0)
 
-M = cv2.moments(c)
-u = int(M["m10"] / M["m00"])
-v = int(M["m01"] / M["m00"])
+u = int(DOWNSCALE * cents[best][0])
+v = int(DOWNSCALE * cents[best][1])
 
 print(f"Detected marker at u={u}, v={v}")
 
@@ -164,8 +182,8 @@ if abs(dx) < DEADZONE_MM and abs(dy) < DEADZONE_MM:
 # ============================================================
 # CLAMP STEP
 # ============================================================
-dx = np.clip(dx, -MAX_STEP_MM, MAX_STEP_MM)
-dy = np.clip(dy, -MAX_STEP_MM, MAX_STEP_MM)
+dx = max(-MAX_STEP_MM, min(MAX_STEP_MM, dx))
+dy = max(-MAX_STEP_MM, min(MAX_STEP_MM, dy))
 
 print(f"STEP MOVE: dx={dx:.1f}, dy={dy:.1f}")
 
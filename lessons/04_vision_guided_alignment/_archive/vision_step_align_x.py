@@ -15,8 +15,8 @@ Lesson 08 — SAFE X-ONLY STEP ALIGNMENT (REFERENCE + SAFETY CORRIDOR)
 import json
 import time
 import os
-import sys
 import select
+import sys
 import numpy as np
 import cv2
 from picamera2 import Picamera2
@@ -49,16 +49,27 @@ with open(HSV_PATH, "r") as f:
 HSV_MIN = np.array(hsv_cfg["lower"], dtype=np.uint8)
 HSV_MAX = np.array(hsv_cfg["upper"], dtype=np.uint8)
 
+# Red can wrap 179 -> 0 (lower hue > upper hue): match [lo..179] | [0..hi]
+HUE_WRAPS = HSV_MIN[0] > HSV_MAX[0]
+HSV_MAX_179 = np.array([179, *HSV_MAX[1:]], dtype=np.uint8)
+HSV_MIN_0 = np.array([0, *HSV_MIN[1:]], dtype=np.uint8)
+
+def hsv_mask(hsv, dst=None):
+    if not HUE_WRAPS:
+        return cv2.inRange(hsv, HSV_MIN, HSV_MAX, dst=dst)
+    mask = cv2.inRange(hsv, HSV_MIN, HSV_MAX_179, dst=dst)
+    cv2.bitwise_or(mask, cv2.inRange(hsv, HSV_MIN_0, HSV_MAX), dst=mask)
+    return mask
+
 # ============================================================
 # LOAD HOMOGRAPHY
 # ============================================================
 H = np.load(H_PATH)
+H00, H01, H02, H10, H11, H12, H20, H21, H22 = H.ravel().tolist()
 
 def uv_to_xy(u, v):
-    p = np.array([u, v, 1.0])
-    r = H @ p
-    r /= r[2]
-    return float(r[0]), float(r[1])
+    w = H20 * u + H21 * v + H22
+    return (H00 * u + H01 * v + H02) / w, (H10 * u + H11 * v + H12) / w
 
 # ============================================================
 # ROBOT SERIAL
@@ -69,20 +80,13 @@ BAUD = 115200
 ser = serial.Serial(ROBOT_PORT, BAUD, timeout=0.1)
 
 # ENABLE TORQUE (CRITICAL)
-ser.write(json.dumps({"T":210,"cmd":1}).encode() + b"\n")
+ser.write(b'{"T":210,"cmd":1}\n')
 time.sleep(0.5)
 
+STEP_FMT = b'{"T":1041,"x":%.2f,"y":0,"z":0,"t":0,"r":0,"g":0}\n'
+
 def move_x_step(dx_mm):
-    cmd = {
-        "T": 1041,
-        "x": round(dx_mm, 2),
-        "y": 0,
-        "z": 0,
-        "t": 0,
-        "r": 0,
-        "g": 0
-    }
-    ser.write((json.dumps(cmd) + "\n").encode())
+    ser.write(STEP_FMT % dx_mm)
 
 # ============================================================
 # CONTROL PARAMETERS (VERY SAFE)
@@ -93,12 +97,46 @@ DEADZONE_MM   = 2.0    # ignore small noise
 MAX_TOTAL_MM  = 10.0   # absolute safety corridor
 LOOP_DT       = 0.30   # seconds between steps
 
+# ============================================================
+# VISION
+# ============================================================
+DOWNSCALE = 4          # detect on 320x180, scale centroid back up
+MIN_AREA  = 300 / (DOWNSCALE * DOWNSCALE)
+OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # drops speckle, keeps blob area
+
+# Preallocated per-frame buffers (filled in place via dst=)
+SMALL_W, SMALL_H = 1280 // DOWNSCALE, 720 // DOWNSCALE
+small_buf = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+hsv_buf   = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+mask_buf  = np.empty((SMALL_H, SMALL_W), np.uint8)
+
+def find_marker(frame):
+    cv2.resize(frame, (SMALL_W, SMALL_H), dst=small_buf,
+               interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(small_buf, cv2.COLOR_BGR2HSV, dst=hsv_buf)
+    mask = hsv_mask(hsv, dst=mask_buf)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
+
+    # One labeling pass gives every blob's area and centroid
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
+        return None
+
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
+        return None
+
+    u, v = cents[best]
+    return int(DOWNSCALE * u), int(DOWNSCALE * v)
+
 # ============================================================
 # CAMERA
 # ============================================================
 picam2 = Picamera2()
-cfg = picam2.create_still_configuration(
-    main={"format": "RGB888", "size": (1280, 720)}
+cfg = picam2.create_video_configuration(
+    main={"format": "RGB888", "size": (1280, 720)},
+    buffer_count=2,
+    queue=False,  # always wait for a fresh frame, never a queued one
 )
 picam2.configure(cfg)
 picam2.start()
@@ -116,66 +154,37 @@ print("Capturing reference position…")
 
 reference_x = None
 while reference_x is None:
-    frame = picam2.capture_array()
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    mask = cv2.inRange(hsv, HSV_MIN, HSV_MAX)
-
-    contours, _ = cv2.findContours(
-        mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-    )
-
-    if contours:
-        c = max(contours, key=cv2.contourArea)
-        if cv2.contourArea(c) > 300:
-            M = cv2.moments(c)
-            if M["m00"] != 0:
-                u = int(M["m10"] / M["m00"])
-                v = int(M["m01"] / M["m00"])
-                reference_x, _ = uv_to_xy(u, v)
-
-    time.sleep(0.1)
+    # capture_array() already blocks for the next frame; no extra sleep
+    marker = find_marker(picam2.capture_array())
+    if marker is not None:
+        reference_x, _ = uv_to_xy(*marker)
 
 print(f"Reference X set to: {reference_x:.2f} mm\n")
 
 # ============================================================
 # MAIN LOOP
 # ============================================================
+# stdin stays blocking (it shares the tty with stdout); a zero-timeout
+# select says whether a line is waiting. The tty is in line mode, so the
+# fd only becomes readable once ENTER is hit.
+STDIN_FD = sys.stdin.fileno()
+
 try:
     while True:
 
         # -------- QUIT --------
-        if sys.stdin in select.select([sys.stdin], [], [], 0)[0]:
-            if sys.stdin.readline().strip().lower() == "q":
+        if select.select([STDIN_FD], [], [], 0)[0]:
+            if os.read(STDIN_FD, 64).strip().lower() == b"q":
                 print("Quit requested")
                 break
 
-        frame = picam2.capture_array()
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, HSV_MIN, HSV_MAX)
-
-        contours, _ = cv2.findContours(
-            mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-        )
-
-        if not contours:
+        marker = find_marker(picam2.capture_array())
+        if marker is None:
             print("No marker detected")
             time.sleep(LOOP_DT)
             continue
 
-        c = max(contours, key=cv2.contourArea)
-        if cv2.contourArea(c) < 300:
-            time.sleep(LOOP_DT)
-            continue
-
-        M = cv2.moments(c)
-        if M["m00"] == 0:
-            time.sleep(LOOP_DT)
-            continue
-
-        u = int(M["m10"] / M["m00"])
-        v = int(M["m01"] / M["m00"])
-
-        current_x, _ = uv_to_xy(u, v)
+        current_x, _ = uv_to_xy(*marker)
 
         # -------- REFERENCE-BASED ERROR --------
         error_x = current_x - reference_x
@@ -191,7 +200,7 @@ try:
             time.sleep(LOOP_DT)
             continue
 
-        step = np.clip(error_x * GAIN, -MAX_STEP_MM, MAX_STEP_MM)
+        step = max(-MAX_STEP_MM, min(MAX_STEP_MM, error_x * GAIN))
 
         move_x_step(step)
         time.sleep(LOOP_DT)
@@ -11,6 +11,7 @@ Self-contained final vision-guided XY alignment.
 
 import time
 import json
+import threading
 import numpy as np
 import cv2
 from pathlib import Path
@@ -49,7 +50,13 @@ if not HOMOGRAPHY_PATH.exists():
 with open(HSV_PATH, "r") as f:
     hsv_cfg = json.load(f)
 
+# Bounds as uint8 arrays once, not rebuilt from lists on every frame
+HSV_LOWER = np.array(hsv_cfg["lower"], np.uint8)
+HSV_UPPER = np.array(hsv_cfg["upper"], np.uint8)
+ROI_MIN_AREA = hsv_cfg.get("min_area", 300)
+
 H = np.load(HOMOGRAPHY_PATH)
+H00, H01, H02, H10, H11, H12, H20, H21, H22 = H.ravel().tolist()
 
 # ==========================================================
 # CAMERA SETUP
@@ -59,55 +66,105 @@ IMG_H = 720
 
 picam2 = Picamera2()
 cfg = picam2.create_video_configuration(
-    main={"format": "RGB888", "size": (IMG_W, IMG_H)}
+    main={"format": "RGB888", "size": (IMG_W, IMG_H)},
+    queue=False,  # always wait for a fresh frame, never a queued one
 )
 picam2.configure(cfg)
 picam2.start()
 
 time.sleep(0.5)
 
+# ==========================================================
+# FRAME GRABBER (capture overlaps processing; newest frame wins)
+# ==========================================================
+frame_cv = threading.Condition()
+latest = {"frame": None}
+stop_grab = threading.Event()
+
+def grab_frames():
+    while not stop_grab.is_set():
+        f = picam2.capture_array()
+        with frame_cv:
+            latest["frame"] = f
+            frame_cv.notify()
+
+def next_frame():
+    """Block until a frame newer than the last one taken is available."""
+    with frame_cv:
+        while latest["frame"] is None:
+            frame_cv.wait()
+        f = latest["frame"]
+        latest["frame"] = None
+    return f
+
+grabber = threading.Thread(target=grab_frames, daemon=True)
+grabber.start()
+
 # ==========================================================
 # CONTROL PARAMETERS
 # ==========================================================
 STEP_MM = 3.0
 PIXEL_TOL = 12
+DOWNSCALE = 4   # detect on 320x180, scale centroid back up
+OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # drops speckle, keeps blob area
+ROI_HALF = 80   # full-res search radius around the last centroid
+MIN_AREA = ROI_MIN_AREA / (DOWNSCALE * DOWNSCALE)
+
+# Preallocated per-frame buffers (filled in place via dst=)
+SMALL_W, SMALL_H = IMG_W // DOWNSCALE, IMG_H // DOWNSCALE
+small_buf = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+hsv_buf   = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+mask_buf  = np.empty((SMALL_H, SMALL_W), np.uint8)
 
 # ==========================================================
 # HELPERS
 # ==========================================================
-def uv_to_xy(u, v, H):
-    pt = np.array([[[u, v]]], dtype=np.float32)
-    out = cv2.perspectiveTransform(pt, H)
-    return float(out[0, 0, 0]), float(out[0, 0, 1])
+def uv_to_xy(u, v):
+    w = H20 * u + H21 * v + H22
+    return (H00 * u + H01 * v + H02) / w, (H10 * u + H11 * v + H12) / w
 
 
-def find_object_center(frame, hsv_cfg):
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+def find_object_center(frame):
+    cv2.resize(frame, (SMALL_W, SMALL_H), dst=small_buf,
+               interpolation=cv2.INTER_AREA)
+    hsv = cv2.cvtColor(small_buf, cv2.COLOR_BGR2HSV, dst=hsv_buf)
 
-    mask = cv2.inRange(
-        hsv,
-        np.array(hsv_cfg["lower"]),
-        np.array(hsv_cfg["upper"]),
-    )
+    mask = cv2.inRange(hsv, HSV_LOWER, HSV_UPPER, dst=mask_buf)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
 
-    contours, _ = cv2.findContours(
-        mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-    )
+    # One labeling pass gives every blob's area and centroid
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
+        return None
 
-    if not contours:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
         return None
 
-    c = max(contours, key=cv2.contourArea)
-    if cv2.contourArea(c) < hsv_cfg.get("min_area", 300):
+    u, v = cents[best]
+    return int(DOWNSCALE * u), int(DOWNSCALE * v)
+
+
+def find_in_roi(frame, last_uv):
+    """Full-res search in a small window around the last centroid."""
+    u0 = max(0, last_uv[0] - ROI_HALF)
+    v0 = max(0, last_uv[1] - ROI_HALF)
+    roi = frame[v0:last_uv[1] + ROI_HALF, u0:last_uv[0] + ROI_HALF]
+
+    hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+    mask = cv2.inRange(hsv, HSV_LOWER, HSV_UPPER)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
+
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
 
-    M = cv2.moments(c)
-    if M["m00"] == 0:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < ROI_MIN_AREA:
         return None
 
-    u = int(M["m10"] / M["m00"])
-    v = int(M["m01"] / M["m00"])
-    return u, v
+    u, v = cents[best]
+    return u0 + int(u), v0 + int(v)
 
 
 # ==========================================================
@@ -116,11 +173,23 @@ def find_object_center(frame, hsv_cfg):
 print("\n=== LESSON 04: VISION-GUIDED ALIGNMENT ===")
 print("CTRL+C to exit\n")
 
+# Image center never moves, so map it once
+x_ctr, y_ctr = uv_to_xy(IMG_W // 2, IMG_H // 2)
+
+last_uv = None
+
 try:
     while True:
-        frame = picam2.capture_array()
+        frame = next_frame()
+
+        # Track in a window around the last hit; full frame on a miss
+        center = None
+        if last_uv is not None:
+            center = find_in_roi(frame, last_uv)
+        if center is None:
+            center = find_object_center(frame)
+        last_uv = center
 
-        center = find_object_center(frame, hsv_cfg)
         if center is None:
             print("Object not detected")
             time.sleep(0.2)
@@ -137,14 +206,13 @@ try:
             time.sleep(0.4)
             continue
 
-        x_obj, y_obj = uv_to_xy(u, v, H)
-        x_ctr, y_ctr = uv_to_xy(IMG_W // 2, IMG_H // 2, H)
+        x_obj, y_obj = uv_to_xy(u, v)
 
         dx = x_obj - x_ctr
         dy = y_obj - y_ctr
 
-        step_x = float(np.clip(dx, -STEP_MM, STEP_MM))
-        step_y = float(np.clip(dy, -STEP_MM, STEP_MM))
+        step_x = max(-STEP_MM, min(STEP_MM, dx))
+        step_y = max(-STEP_MM, min(STEP_MM, dy))
 
         print(f"Step XY: ({step_x:.2f}, {step_y:.2f})")
 
@@ -156,4 +224,6 @@ except KeyboardInterrupt:
     print("\nExiting")
 
 finally:
+    stop_grab.set()
+    grabber.join(timeout=1.0)
     picam2.stop()
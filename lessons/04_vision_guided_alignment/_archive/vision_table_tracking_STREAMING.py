@@ -11,7 +11,8 @@ Key rules:
 - No deltas
 """
 
-import time, json, math
+import time, json, math, threading
+from collections import deque
 import numpy as np
 import cv2
 import serial
@@ -34,6 +35,15 @@ DT = 0.04        # ~25 Hz (same feel)
 X_MIN, X_MAX = 150.0, 350.0
 Y_MIN, Y_MAX = -150.0, 150.0
 
+def wait_next_tick(deadline):
+    """Sleep to the next fixed-phase tick; resync after an overrun."""
+    deadline += DT
+    slack = deadline - time.monotonic()
+    if slack > 0:
+        time.sleep(slack)
+        return deadline
+    return time.monotonic()
+
 # -------------------------------
 # PATHS (YOUR FILES)
 # -------------------------------
@@ -44,8 +54,37 @@ H_PATH   = PROJECT_ROOT / "lessons/04_vision_guided_alignment/data/homography_ma
 # -------------------------------
 # UART helper
 # -------------------------------
+# Compact separators: shorter lines, less UART time per command
+_enc = json.JSONEncoder(separators=(",", ":")).encode
+
 def send(ser, cmd):
-    ser.write((json.dumps(cmd) + "\n").encode("ascii"))
+    ser.write(_enc(cmd).encode("ascii") + b"\n")
+
+# Fixed-shape streaming command; only x/y change per frame
+T1041_FMT = b'{"T":1041,"x":%.1f,"y":%.1f,"z":%.1f,"t":%.1f,"r":%.1f,"g":%.1f}\n'
+
+# -------------------------------
+# UART writer thread (newest target wins)
+# -------------------------------
+# A 1-slot deque coalesces targets: if the UART is still draining the
+# previous line, a stale pose is replaced instead of queued.
+cmd_slot = deque(maxlen=1)
+cmd_ready = threading.Event()
+stop_write = threading.Event()
+
+def write_commands(ser):
+    while not stop_write.is_set():
+        cmd_ready.wait(timeout=0.1)
+        cmd_ready.clear()
+        try:
+            line = cmd_slot.popleft()
+        except IndexError:
+            continue
+        ser.write(line)
+
+def send_async(line):
+    cmd_slot.append(line)
+    cmd_ready.set()
 
 # -------------------------------
 # CAMERA
@@ -54,12 +93,36 @@ IMG_W, IMG_H = 1280, 720
 
 picam2 = Picamera2()
 cfg = picam2.create_video_configuration(
-    main={"format": "RGB888", "size": (IMG_W, IMG_H)}
+    main={"format": "RGB888", "size": (IMG_W, IMG_H)},
+    queue=False,  # always wait for a fresh frame, never a queued one
 )
 picam2.configure(cfg)
 picam2.start()
 time.sleep(0.3)
 
+# -------------------------------
+# FRAME GRABBER (capture overlaps processing; newest frame wins)
+# -------------------------------
+frame_cv = threading.Condition()
+latest = {"frame": None}
+stop_grab = threading.Event()
+
+def grab_frames():
+    while not stop_grab.is_set():
+        f = picam2.capture_array()
+        with frame_cv:
+            latest["frame"] = f
+            frame_cv.notify()
+
+def next_frame():
+    """Block until a frame newer than the last one taken is available."""
+    with frame_cv:
+        while latest["frame"] is None:
+            frame_cv.wait()
+        f = latest["frame"]
+        latest["frame"] = None
+    return f
+
 # -------------------------------
 # LOAD HSV + HOMOGRAPHY
 # -------------------------------
@@ -68,35 +131,45 @@ with open(HSV_PATH) as f:
 
 HSV_LOWER = np.array(hsv["lower"], np.uint8)
 HSV_UPPER = np.array(hsv["upper"], np.uint8)
-MIN_AREA  = hsv.get("min_area", 300)
+DOWNSCALE = 4    # detect on 320x180, scale centroid back up
+MIN_AREA  = hsv.get("min_area", 300) / (DOWNSCALE * DOWNSCALE)
+OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # drops speckle, keeps blob area
+
+# Preallocated per-frame buffers (filled in place via dst=)
+SMALL_W, SMALL_H = IMG_W // DOWNSCALE, IMG_H // DOWNSCALE
+small_buf = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+hsv_buf   = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+mask_buf  = np.empty((SMALL_H, SMALL_W), np.uint8)
 
 H = np.load(H_PATH)
+H00, H01, H02, H10, H11, H12, H20, H21, H22 = H.ravel().tolist()
 
 def uv_to_xy(u, v):
-    pt = np.array([[[u, v]]], np.float32)
-    out = cv2.perspectiveTransform(pt, H)
-    return float(out[0,0,0]), float(out[0,0,1])
+    w = H20 * u + H21 * v + H22
+    return (H00 * u + H01 * v + H02) / w, (H10 * u + H11 * v + H12) / w
 
 # -------------------------------
 # VISION
 # -------------------------------
 def find_ball(frame):
-    hsv_img = cv2.cvtColor(frame, cv2.COLOR_RGB2HSV)
-    mask = cv2.inRange(hsv_img, HSV_LOWER, HSV_UPPER)
-
-    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not cnts:
-        return None
-
-    c = max(cnts, key=cv2.contourArea)
-    if cv2.contourArea(c) < MIN_AREA:
+    cv2.resize(frame, (SMALL_W, SMALL_H), dst=small_buf,
+               interpolation=cv2.INTER_AREA)
+    # picamera2 "RGB888" is B,G,R in memory; profiles come from calibrate_hsv.py (BGR2HSV)
+    hsv_img = cv2.cvtColor(small_buf, cv2.COLOR_BGR2HSV, dst=hsv_buf)
+    mask = cv2.inRange(hsv_img, HSV_LOWER, HSV_UPPER, dst=mask_buf)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
+
+    # One labeling pass gives every blob's area and centroid
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
 
-    M = cv2.moments(c)
-    if M["m00"] == 0:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
         return None
 
-    return int(M["m10"]/M["m00"]), int(M["m01"]/M["m00"])
+    u, v = cents[best]
+    return int(DOWNSCALE * u), int(DOWNSCALE * v)
 
 # -------------------------------
 # MAIN
@@ -109,16 +182,23 @@ def main():
     send(ser, {"T":210, "cmd":1})
     time.sleep(0.2)
 
+    grabber = threading.Thread(target=grab_frames, daemon=True)
+    grabber.start()
+    writer = threading.Thread(target=write_commands, args=(ser,), daemon=True)
+    writer.start()
+
     print("\n=== VISION TRACKING (CIRCLE-SCRIPT STYLE) ===")
     print("Z locked, orientation locked, absolute XYZ\n")
 
+    next_tick = time.monotonic()
+
     try:
         while True:
-            frame = picam2.capture_array()
+            frame = next_frame()
             ball = find_ball(frame)
 
             if ball is None:
-                time.sleep(DT)
+                next_tick = wait_next_tick(next_tick)
                 continue
 
             u, v = ball
@@ -129,23 +209,19 @@ def main():
             y = max(Y_MIN, min(Y_MAX, y))
 
             # EXACT SAME STRUCTURE AS CIRCLE DEMO
-            send(ser, {
-                "T": 1041,
-                "x": x,
-                "y": y,
-                "z": Z_LOCK,
-                "t": T_LOCK,
-                "r": R_LOCK,
-                "g": G_LOCK,
-            })
-
-            time.sleep(DT)
+            send_async(T1041_FMT % (x, y, Z_LOCK, T_LOCK, R_LOCK, G_LOCK))
+
+            next_tick = wait_next_tick(next_tick)
 
     except KeyboardInterrupt:
         print("\nStopping")
 
     finally:
+        stop_grab.set()
+        grabber.join(timeout=1.0)
         picam2.stop()
+        stop_write.set()
+        writer.join(timeout=1.0)
         ser.close()
 
 if __name__ == "__main__":
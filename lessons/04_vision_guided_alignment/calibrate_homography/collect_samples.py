@@ -98,23 +98,21 @@ def get_fresh_robot_xy():
     return None
 
 def detect_uv(frame):
-    hsv = cv2.cvtColor(frame, cv2.COLOR_RGB2HSV)
+    # picamera2 "RGB888" is B,G,R in memory; profiles come from calibrate_hsv.py (BGR2HSV)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
     mask = cv2.inRange(hsv, HSV_LOWER, HSV_UPPER)
 
-    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not cnts:
+    # Labeling pass gives each blob's area and centroid; no cv2.moments
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
 
-    c = max(cnts, key=cv2.contourArea)
-    if cv2.contourArea(c) < MIN_AREA:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
         return None
 
-    M = cv2.moments(c)
-    if M["m00"] == 0:
-        return None
-
-    u = int(M["m10"] / M["m00"])
-    v = int(M["m01"] / M["m00"])
+    u = int(cents[best][0])
+    v = int(cents[best][1])
     return u, v
 
 # --------------------------------
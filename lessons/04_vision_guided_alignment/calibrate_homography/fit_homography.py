@@ -60,16 +60,11 @@ data = data[-USE_LAST_N:]
 # --------------------------------
 # PREP DATA
 # --------------------------------
-uv = []
-xy = []
+# One (N, 4) array parsed in a single call: columns are u, v, x, y
+samples = np.array([r[:4] for r in data], dtype=np.float32)
 
-for r in data:
-    u, v, x, y = map(float, r[:4])
-    uv.append([u, v])
-    xy.append([x, y])
-
-uv = np.array(uv, dtype=np.float32)
-xy = np.array(xy, dtype=np.float32)
+uv = np.ascontiguousarray(samples[:, :2])
+xy = np.ascontiguousarray(samples[:, 2:])
 
 # --------------------------------
 # FIT HOMOGRAPHY
@@ -85,18 +80,14 @@ print("\nH =\n", H)
 # --------------------------------
 # ERROR CHECK
 # --------------------------------
-errors = []
-
-for i in range(len(uv)):
-    uv_h = np.array([uv[i][0], uv[i][1], 1.0])
-    xy_hat = H @ uv_h
-    xy_hat /= xy_hat[2]
+# Reproject every sample in one matrix product: (N, 3) @ H^T
+uv_h = np.column_stack([uv, np.ones(len(uv))])
+xy_hat = uv_h @ H.T
+xy_hat = xy_hat[:, :2] / xy_hat[:, 2:]
 
-    dx = xy_hat[0] - xy[i][0]
-    dy = xy_hat[1] - xy[i][1]
-    err = np.sqrt(dx * dx + dy * dy)
-    errors.append(err)
+errors = np.hypot(*(xy_hat - xy).T)
 
+for i, err in enumerate(errors):
     print(f"  Sample {i+1:02d}: {err:6.2f} mm")
 
 print(f"\nMean error: {np.mean(errors):.2f} mm")
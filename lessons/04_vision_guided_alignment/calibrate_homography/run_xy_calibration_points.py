@@ -28,18 +28,19 @@ MOVE_DELAY = 0.5  # seconds after move command
 # ===============================
 Z_FIXED = 100.0
 
+# Floats up front, so the command dict needs no per-move casts
 POINTS = [
-    (100, -200),
-    (250, -200),
-    (400, -200),
+    (100.0, -200.0),
+    (250.0, -200.0),
+    (400.0, -200.0),
 
-    (100,    0),
-    (250,    0),
-    (400,    0),
+    (100.0,    0.0),
+    (250.0,    0.0),
+    (400.0,    0.0),
 
-    (100,  200),
-    (250,  200),
-    (400,  200),
+    (100.0,  200.0),
+    (250.0,  200.0),
+    (400.0,  200.0),
 ]
 
 # ===============================
@@ -66,8 +67,8 @@ def main():
 
             send(ser, {
                 "T": 1041,
-                "x": float(x),
-                "y": float(y),
+                "x": x,
+                "y": y,
                 "z": Z_FIXED,
                 "t": 0.0,
                 "r": 0.0,
@@ -11,7 +11,7 @@ Key rules:
 - No deltas
 """
 
-import time, json, math
+import os, time, json, math, threading
 import numpy as np
 import cv2
 import serial
@@ -67,19 +67,79 @@ def choose_hsv_profile():
 def send(ser, cmd):
     ser.write((json.dumps(cmd) + "\n").encode("ascii"))
 
+# Streaming command with the locked axes baked in; only x/y vary
+T1041_FMT = (
+    b'{"T":1041,"x":%%.1f,"y":%%.1f,"z":%.1f,"t":%.1f,"r":%.1f,"g":%.1f}\n'
+    % (Z_LOCK, T_LOCK, R_LOCK, G_LOCK)
+)
+
+# -------------------------------
+# SCHEDULING (best effort)
+# -------------------------------
+CONTROL_CPU  = 3     # keep the control loop off the cores libcamera uses
+CONTROL_PRIO = 20    # SCHED_FIFO priority (1-99)
+
+def raise_control_priority():
+    """Pin the calling thread to CONTROL_CPU and make it SCHED_FIFO.
+
+    Needs CAP_SYS_NICE (sudo or setcap); without it the loop just runs
+    at normal priority.
+    """
+    try:
+        os.sched_setaffinity(0, {CONTROL_CPU})
+    except (AttributeError, OSError) as e:
+        print(f"Note: CPU pinning unavailable ({e})")
+
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(CONTROL_PRIO))
+    except (AttributeError, OSError) as e:
+        print(f"Note: SCHED_FIFO unavailable ({e})")
+
 # -------------------------------
 # CAMERA
 # -------------------------------
+# Capture at the 1280x720 the homography was fit on, so the sensor mode
+# (and field of view) match calibration; detection runs downscaled below.
 IMG_W, IMG_H = 1280, 720
 
 picam2 = Picamera2()
 cfg = picam2.create_video_configuration(
-    main={"format": "RGB888", "size": (IMG_W, IMG_H)}
+    main={"format": "RGB888", "size": (IMG_W, IMG_H)},
+    buffer_count=4,
 )
 picam2.configure(cfg)
 picam2.start()
 time.sleep(0.3)
 
+class FrameGrabber(threading.Thread):
+    """Daemon thread that keeps only the newest camera frame."""
+
+    def __init__(self, cam):
+        super().__init__(daemon=True)
+        self.cam = cam
+        self.frame = None
+        self.cond = threading.Condition()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            f = self.cam.capture_array()
+            with self.cond:
+                self.frame = f
+                self.cond.notify()
+
+    def read(self):
+        """Return the newest unread frame, waiting if none has arrived."""
+        with self.cond:
+            while self.frame is None:
+                self.cond.wait()
+            f, self.frame = self.frame, None
+        return f
+
+    def stop(self):
+        self.running = False
+        self.join(timeout=1.0)
+
 # -------------------------------
 # LOAD HSV + HOMOGRAPHY
 # -------------------------------
@@ -92,35 +152,50 @@ HSV_LOWER = np.array(hsv["lower"], np.uint8)
 HSV_UPPER = np.array(hsv["upper"], np.uint8)
 MIN_AREA  = hsv.get("min_area", 300)
 
+DOWNSCALE = 4    # detect on 320x180, scale centroid back to capture px
+MIN_AREA /= DOWNSCALE * DOWNSCALE
+OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))  # drops speckle, keeps blob area
+
+# Preallocated per-frame buffers (filled in place via dst=)
+SMALL_W, SMALL_H = IMG_W // DOWNSCALE, IMG_H // DOWNSCALE
+small_buf = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+hsv_buf   = np.empty((SMALL_H, SMALL_W, 3), np.uint8)
+mask_buf  = np.empty((SMALL_H, SMALL_W), np.uint8)
+
 print(f"\nTracking HSV profile: {HSV_PATH.name}")
 
 H = np.load(H_PATH)
 
+# Homography as scalars: capture-pixel centroids map directly to table XY
+H00, H01, H02, H10, H11, H12, H20, H21, H22 = H.ravel().tolist()
+
 def uv_to_xy(u, v):
-    pt = np.array([[[u, v]]], np.float32)
-    out = cv2.perspectiveTransform(pt, H)
-    return float(out[0,0,0]), float(out[0,0,1])
+    w = H20 * u + H21 * v + H22
+    return (H00 * u + H01 * v + H02) / w, (H10 * u + H11 * v + H12) / w
 
 # -------------------------------
 # VISION
 # -------------------------------
 def find_ball(frame):
-    hsv_img = cv2.cvtColor(frame, cv2.COLOR_RGB2HSV)
-    mask = cv2.inRange(hsv_img, HSV_LOWER, HSV_UPPER)
-
-    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    if not cnts:
-        return None
-
-    c = max(cnts, key=cv2.contourArea)
-    if cv2.contourArea(c) < MIN_AREA:
+    cv2.resize(frame, (SMALL_W, SMALL_H), dst=small_buf,
+               interpolation=cv2.INTER_AREA)
+    # picamera2 "RGB888" is B,G,R in memory; profiles come from calibrate_hsv.py (BGR2HSV)
+    hsv_img = cv2.cvtColor(small_buf, cv2.COLOR_BGR2HSV, dst=hsv_buf)
+    mask = cv2.inRange(hsv_img, HSV_LOWER, HSV_UPPER, dst=mask_buf)
+    # Open before labeling so low-light speckle doesn't become hundreds of blobs
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, OPEN_KERNEL, dst=mask)
+
+    # One labeling pass gives every blob's area and centroid
+    n, _, stats, cents = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    if n < 2:
         return None
 
-    M = cv2.moments(c)
-    if M["m00"] == 0:
+    best = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    if stats[best, cv2.CC_STAT_AREA] < MIN_AREA:
         return None
 
-    return int(M["m10"]/M["m00"]), int(M["m01"]/M["m00"])
+    u, v = cents[best]
+    return DOWNSCALE * u, DOWNSCALE * v
 
 # -------------------------------
 # MAIN
@@ -133,12 +208,18 @@ def main():
     send(ser, {"T":210, "cmd":1})
     time.sleep(0.2)
 
+    grabber = FrameGrabber(picam2)
+    grabber.start()
+
+    # After the grabber starts, so only this (control) thread is pinned
+    raise_control_priority()
+
     print("\n=== VISION TRACKING (CIRCLE-SCRIPT STYLE) ===")
     print("Z locked, orientation locked, absolute XYZ\n")
 
     try:
         while True:
-            frame = picam2.capture_array()
+            frame = grabber.read()
             ball = find_ball(frame)
 
             if ball is None:
@@ -152,15 +233,7 @@ def main():
             x = max(X_MIN, min(X_MAX, x))
             y = max(Y_MIN, min(Y_MAX, y))
 
-            send(ser, {
-                "T": 1041,
-                "x": x,
-                "y": y,
-                "z": Z_LOCK,
-                "t": T_LOCK,
-                "r": R_LOCK,
-                "g": G_LOCK,
-            })
+            ser.write(T1041_FMT % (x, y))
 
             time.sleep(DT)
 
@@ -168,6 +241,7 @@ def main():
         print("\nStopping")
 
     finally:
+        grabber.stop()
         picam2.stop()
         ser.close()
 
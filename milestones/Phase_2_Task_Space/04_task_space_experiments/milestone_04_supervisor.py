@@ -78,7 +78,11 @@ class TaskSpaceSupervisor:
         CX, CY, CZ = 240.0, 0.0, 260.0
         R_START, R_END = 120.0, 20.0
         STEPS = 180 # Clean verification run
+        DT = 0.03   # Target period per waypoint
         
+        # Pace on a monotonic deadline: the handshake readline already
+        # eats part of each period, so only sleep what is left of it.
+        next_t = time.monotonic()
         for i in range(STEPS):
             alpha = i / STEPS
             r = (1 - alpha) * R_START + alpha * R_END
@@ -89,7 +93,13 @@ class TaskSpaceSupervisor:
             
             # The 'move_xyz' method handles the JSON and the handshake
             self.move_xyz(tx, ty, CZ)
-            time.sleep(0.03)
+
+            next_t += DT
+            slack = next_t - time.monotonic()
+            if slack > 0:
+                time.sleep(slack)
+            else:
+                next_t = time.monotonic()  # overran; resync, don't burst
 
 if __name__ == "__main__":
     arm = TaskSpaceSupervisor()
@@ -16,6 +16,12 @@ PORT = "/dev/ttyUSB0"
 BAUD = 115200
 TIMEOUT = 0.5
 
+# Settle detection: poll T:105 until two consecutive poses agree
+SETTLE_MIN = 0.3       # s, let the move start before sampling
+SETTLE_POLL = 0.1      # s between T:105 polls
+SETTLE_TOL = 0.5       # mm, |dx|+|dy|+|dz| between polls counts as stopped
+SETTLE_TIMEOUT = 3.0   # s, give up and report the last pose
+
 class IKValidator:
     def __init__(self):
         try:
@@ -37,6 +43,31 @@ class IKValidator:
         self.ser.write(line.encode("ascii"))
         return self.ser.readline().decode("ascii", errors="ignore").strip()
 
+    def wait_settled(self):
+        """
+        Polls T:105 until the reported pose stops changing and returns
+        that feedback dict (the last one seen on timeout, or None).
+        """
+        time.sleep(SETTLE_MIN)
+        deadline = time.monotonic() + SETTLE_TIMEOUT
+        data, last = None, None
+
+        while time.monotonic() < deadline:
+            try:
+                fb = json.loads(self.send({"T": 105}))
+                pose = (float(fb["x"]), float(fb["y"]), float(fb["z"]))
+            except (ValueError, KeyError, TypeError):
+                time.sleep(SETTLE_POLL)
+                continue
+
+            data = fb
+            if last is not None and sum(abs(a - b) for a, b in zip(pose, last)) < SETTLE_TOL:
+                break
+            last = pose
+            time.sleep(SETTLE_POLL)
+
+        return data
+
     def validate_coordinate(self, x, y, z):
         """
         Commands a move and then polls T:105 to verify the 
@@ -46,12 +77,10 @@ class IKValidator:
         
         # 1. Send Move Command (T:104)
         self.send({"T": 104, "x": x, "y": y, "z": z, "t": 0, "r": 0, "g": 3.0, "spd": 0.5})
-        time.sleep(1.5) # Wait for physical travel
         
-        # 2. Poll Status (T:105)
-        response = self.send({"T": 105})
+        # 2. Poll Status (T:105) until the arm has stopped moving
+        data = self.wait_settled()
         try:
-            data = json.loads(response)
             actual_x = data.get('x')
             actual_y = data.get('y')
             actual_z = data.get('z')
@@ -11,6 +11,7 @@ import time
 import json
 import math
 import serial
+import numpy as np
 from datetime import datetime
 
 # --- CONFIGURATION ---
@@ -46,12 +47,31 @@ class TrajectorySupervisor:
         # We capture the line to keep the serial buffer clean
         return self.ser.readline()
 
+    def stream(self, msg):
+        """Fire-and-forget write for T:1041 streaming (no readline barrier)."""
+        line = json.dumps(msg) + "\n"
+        self.ser.write(line.encode("utf-8"))
+
+    def build_path(self):
+        """
+        Precomputes every (x, y) waypoint of the converging spiral in one
+        vectorized pass, so the streaming loop only formats and writes.
+        """
+        alpha = np.arange(STEPS) / STEPS
+        radius = (1 - alpha) * R_START + alpha * R_END
+        theta = 2.0 * math.pi * alpha * 3.0  # 3 full rotations
+
+        xs = np.round(CX + radius * np.cos(theta), 2)
+        ys = np.round(CY + radius * np.sin(theta), 2)
+        return list(zip(xs.tolist(), ys.tolist()))
+
     def run_milestone_06(self):
         """
         Implementation: Converting parametric equations into 
         a smooth coordinate stream using T:1041.
         """
         self.log("Starting Continuous Path Verification (T:1041)...")
+        path = self.build_path()
         
         # 1. Discreet move to starting pose
         self.send({
@@ -61,25 +81,20 @@ class TrajectorySupervisor:
         time.sleep(2.0)
 
         # 2. Continuous Trajectory Loop
-        for i in range(STEPS):
-            alpha = i / STEPS
-            radius = (1 - alpha) * R_START + alpha * R_END
-            theta = 2.0 * math.pi * alpha * 3.0 # 3 full rotations
-
-            target_x = CX + radius * math.cos(theta)
-            target_y = CY + radius * math.sin(theta)
-
+        for target_x, target_y in path:
             # T: 1041 is the 'Streaming' command specified in M06
             cmd = {
                 "T": 1041,
-                "x": round(target_x, 2),
-                "y": round(target_y, 2),
+                "x": target_x,
+                "y": target_y,
                 "z": CZ,
                 "t": 0, "r": 0, "g": 3.0
             }
-            self.send(cmd)
+            self.stream(cmd)
             time.sleep(DT)
 
+        # Discard any replies that piled up during the stream
+        self.ser.reset_input_buffer()
         self.log("Milestone 06 Complete: Smooth path verified.")
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@ import numpy as np
 # --- SERIAL CONFIG ---
 PORT = "/dev/ttyUSB0"
 BAUD = 115200
+STREAM_DT = 0.05  # seconds between streamed T:1041 points
 
 # --- ARM GEOMETRY (from Milestone 08) ---
 L1 = 238.0
@@ -28,15 +29,29 @@ def forward_kinematics(joints):
     z = L1 * math.sin(s) + L2 * math.sin(s + e)
     return x, z
 
-def get_firmware_status(ser):
+def get_firmware_status(ser, timeout=2.0):
+    """Request T:105 and return the first T:1051 reply (None on timeout)."""
     ser.write(b'{"T":105}\n')
-    for _ in range(15):
-        line = ser.readline().decode(errors="ignore")
-        if "{" in line:
+    deadline = time.monotonic() + timeout
+    buf = bytearray()
+
+    while time.monotonic() < deadline:
+        # Take everything already waiting in one read; split complete lines
+        buf += ser.read(ser.in_waiting or 1)
+        *lines, rest = buf.split(b"\n")
+        buf = bytearray(rest)
+
+        for line in lines:
+            start = line.find(b"{")
+            if start < 0:
+                continue
             try:
-                return json.loads(line[line.find("{"):])
-            except:
-                pass
+                msg = json.loads(line[start:])
+            except ValueError:
+                continue
+            # Skip echoes of the streamed T:1041 lines; only the pose counts
+            if isinstance(msg, dict) and msg.get("T") == 1051:
+                return msg
     return None
 
 def main():
@@ -53,9 +68,15 @@ def main():
         {"T":1041, "x":340, "y":0, "z":210, "t":0, "r":0, "g":3.0},
     ]
 
-    for cmd in stream_cmds:
+    # T:1041 must be paced: on a monotonic deadline, one line every
+    # STREAM_DT, so write time comes out of the wait instead of adding to it
+    t0 = time.monotonic()
+    for i, cmd in enumerate(stream_cmds, start=1):
         ser.write((json.dumps(cmd) + "\n").encode())
-        time.sleep(0.05)
+
+        slack = t0 + i * STREAM_DT - time.monotonic()
+        if slack > 0:
+            time.sleep(slack)
 
     time.sleep(1.5)  # allow motion to settle
 
@@ -25,20 +25,24 @@ time.sleep(2)
 print("Serial connected to arm")
 
 
+# Pose command built once; only "t" is updated per message
+POSE_CMD = {
+    "T":104,
+    "x":X,
+    "y":Y,
+    "z":Z,
+    "t":0.0,
+    "r":0,
+    "g":3,
+    "spd":0.4
+}
+
+
 def send_pose():
 
-    cmd = {
-        "T":104,
-        "x":X,
-        "y":Y,
-        "z":Z,
-        "t":base_angle,
-        "r":0,
-        "g":3,
-        "spd":0.4
-    }
-
-    ser.write((json.dumps(cmd) + "\n").encode())
+    POSE_CMD["t"] = base_angle
+
+    ser.write((json.dumps(POSE_CMD) + "\n").encode())
 
 
 def on_connect(client, userdata, flags, rc):
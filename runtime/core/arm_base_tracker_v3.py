@@ -32,14 +32,18 @@ print("Connected to RoArm")
 ser.write((json.dumps({"T":210,"cmd":1})+"\n").encode())
 
 
-def move_arm():
+# One coordinated T:102 (all joints by name) per update; only the
+# base moves, so the other five are baked in once
+T102_FMT = (
+    b'{"T":102,"base":%%.4f,"shoulder":%s,"elbow":%s,"wrist":%s,'
+    b'"roll":%s,"hand":%s,"spd":0,"acc":10}\n'
+    % tuple(json.dumps(j).encode() for j in (joint2, joint3, joint4, joint5, joint6))
+)
+
 
-    cmd = {
-        "T":101,
-        "joint":[base_angle, joint2, joint3, joint4, joint5, joint6]
-    }
+def move_arm():
 
-    ser.write((json.dumps(cmd)+"\n").encode())
+    ser.write(T102_FMT % base_angle)
 
 
 def on_connect(client, userdata, flags, rc):
@@ -67,17 +67,25 @@ def run_lissajous():
 
     time.sleep(2)
 
+    # Hot loop: bind globals/attributes to locals once, not per step
+    cos, sin = math.cos, math.sin
+    write, dumps, sleep = ser.write, json.dumps, time.sleep
+    dphi = 2*math.pi/STEPS
+    half_len = LENGTH/2
+
     for i in range(STEPS):
 
-        phi = 2*math.pi*(i/STEPS)
+        phi = dphi*i
+        c = cos(phi)
+        s = sin(phi)
 
-        tx = CX + (LENGTH/2)*math.cos(phi)
-        ty = CY + WIDTH*math.sin(2*phi)
-        tz = CZ + HEIGHT*math.sin(phi)
+        tx = CX + half_len*c
+        ty = CY + WIDTH*sin(2*phi)
+        tz = CZ + HEIGHT*s
 
-        tt = 0.3*math.cos(phi)
+        tt = 0.3*c
 
-        send_json({
+        write((dumps({
             "T":1041,
             "x":round(tx,2),
             "y":round(ty,2),
@@ -85,9 +93,9 @@ def run_lissajous():
             "t":round(tt,2),
             "r":0,
             "g":GRIPPER_RAD
-        })
+        }) + "\n").encode("utf-8"))
 
-        time.sleep(DT)
+        sleep(DT)
 
     print("Returning to candle")
 
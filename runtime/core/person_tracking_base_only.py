@@ -4,6 +4,7 @@ import paho.mqtt.client as mqtt
 import serial
 import json
 import time
+import os
 
 PORT = "/dev/ttyUSB0"
 BAUD = 115200
@@ -13,6 +14,10 @@ TOPIC = "robot/track"
 
 FRAME_WIDTH = 640
 
+# Per-message prints slow the MQTT callback on a slow terminal (ssh/tmux);
+# set ROARM_VERBOSE=1 to see them
+VERBOSE = os.environ.get("ROARM_VERBOSE") == "1"
+
 MAX_BASE = 1.6
 MIN_BASE = -1.6
 
@@ -30,24 +35,19 @@ HAND = 3.14
 ser = serial.Serial(PORT, BAUD, timeout=0.1)
 time.sleep(2)
 
-def send_pose(base):
+# Fixed-shape T:102 pose; only the base angle changes per message
+T102_FMT = (
+    b'{"T":102,"base":%%.6f,"shoulder":%s,"elbow":%s,"wrist":%s,'
+    b'"roll":%s,"hand":%s,"spd":100,"acc":70}\n'
+    % tuple(json.dumps(j).encode() for j in (SHOULDER, ELBOW, WRIST, ROLL, HAND))
+)
 
-    cmd = {
-        "T":102,
-        "base":base,
-        "shoulder":SHOULDER,
-        "elbow":ELBOW,
-        "wrist":WRIST,
-        "roll":ROLL,
-        "hand":HAND,
-        "spd":100,
-        "acc":70
-    }
+def send_pose(base):
 
-    ser.write((json.dumps(cmd)+"\n").encode())
+    ser.write(T102_FMT % base)
 
 print("Torque ON")
-ser.write((json.dumps({"T":210,"cmd":1})+"\n").encode())
+ser.write(b'{"T":210,"cmd":1}\n')
 
 time.sleep(1)
 
@@ -83,7 +83,8 @@ def on_message(client, userdata, msg):
 
     current_base = current_base + (target-current_base)*SMOOTH
 
-    print("Target:", round(target,2), "Base:", round(current_base,2))
+    if VERBOSE:
+        print("Target:", round(target,2), "Base:", round(current_base,2))
 
     send_pose(current_base)
 
@@ -14,8 +14,8 @@ def run():
         time.sleep(1)
         
         # Wake the solver and release motors so you can move them
-        s.write(b'{"command":"torque_set","cmd":0}\n')
-        s.write(b'{"command":"echo_on"}\n')
+        s.write(b'{"command":"torque_set","cmd":0}\n'
+                b'{"command":"echo_on"}\n')
         
         print("\033[2J") # Clear Screen
         while True:
@@ -27,20 +27,24 @@ def run():
                     raw = line[line.find('{'):line.rfind('}')+1]
                     data = json.loads(raw).get("result", [])
                     if len(data) >= 10:
-                        sys.stdout.write("\033[H")
-                        print("=== ROARM INTERNAL SOLVER MONITOR ===")
-                        print(f"HARDCODED LENGTHS: {L_LENGTHS}")
-                        print("-" * 40)
-                        print(f"XYZ RESULT (SOLVER OUTPUT):")
-                        print(f" X: {data[0]:.2f} mm")
-                        print(f" Y: {data[1]:.2f} mm")
-                        print(f" Z: {data[2]:.2f} mm")
-                        print("-" * 40)
-                        print(f"RADIAN SOURCE (ENCODER INPUT):")
-                        print(f" J1-J3: {data[4]:.3f}, {data[5]:.3f}, {data[6]:.3f}")
-                        print(f" J4-J6: {data[7]:.3f}, {data[8]:.3f}, {data[9]:.3f}")
-                        print("-" * 40)
-                        print("MOVE ARM MANUALLY TO SEE CALCULATION")
+                        # Build the whole screen, then one write + flush
+                        sys.stdout.write(
+                            "\033[H"
+                            "=== ROARM INTERNAL SOLVER MONITOR ===\n"
+                            f"HARDCODED LENGTHS: {L_LENGTHS}\n"
+                            + "-" * 40 + "\n"
+                            "XYZ RESULT (SOLVER OUTPUT):\n"
+                            f" X: {data[0]:.2f} mm\n"
+                            f" Y: {data[1]:.2f} mm\n"
+                            f" Z: {data[2]:.2f} mm\n"
+                            + "-" * 40 + "\n"
+                            "RADIAN SOURCE (ENCODER INPUT):\n"
+                            f" J1-J3: {data[4]:.3f}, {data[5]:.3f}, {data[6]:.3f}\n"
+                            f" J4-J6: {data[7]:.3f}, {data[8]:.3f}, {data[9]:.3f}\n"
+                            + "-" * 40 + "\n"
+                            "MOVE ARM MANUALLY TO SEE CALCULATION\n"
+                        )
+                        sys.stdout.flush()
                 except:
                     continue
             time.sleep(0.05)
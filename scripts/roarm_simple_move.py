@@ -4,10 +4,17 @@ import json
 import time
 import serial
 
+# Optional: orjson serializes straight to bytes. Falls back to json.
+try:
+    from orjson import dumps as _dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 def send_cmd(ser, cmd_dict):
-    msg = json.dumps(cmd_dict) + "\n"
-    ser.write(msg.encode('utf-8'))
-    print(f"→ Sent: {msg.strip()}")
+    msg = _dumps(cmd_dict) + b"\n"
+    ser.write(msg)
+    print(f"→ Sent: {msg.strip().decode('utf-8')}")
 
 def main():
     parser = argparse.ArgumentParser()